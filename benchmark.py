@@ -0,0 +1,353 @@
+#benchmark.py
+#
+# Offline benchmark for the simulation pipeline. Sweeps the customer population
+# (at a fixed number of months) and the number of months (at a fixed population)
+# and records wall time, throughput and peak RSS for every stage:
+#
+#   python benchmark.py                         # full sweep, compare with baseline
+#   python benchmark.py --quick                 # small sweep for a quick check
+#   python benchmark.py --save-baseline         # record a new baseline
+#   python benchmark.py --months                # size curve only
+#   python benchmark.py --sizes                 # months curve only
+#   python benchmark.py --uncapped --months     # size curve without main.py's sample caps
+#
+# past_product_interest is 1 for every customer with two or more months of
+# transactions, which sends train_model down its single-class shortcut. The
+# model stages therefore train on a median split of total_amount instead, so
+# every backend really fits and predicts.
+# The LLM parser is never called: filters come from stub_parse_with_mistral,
+# so the benchmark runs without network access or MISTRAL_API_KEY.
+# Memory is read from /proc/self/statm, so it is only measured on Linux.
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_generator import generate_customers, generate_transactions
+from features import aggregate_transactions, product_effect_score, twin_response_label
+from model_train import get_features_targets, train_model
+
+SIZES = [1000, 10000, 100000, 1000000]
+MONTHS = [1, 6, 12, 24]
+QUICK_SIZES = [1000, 5000]
+QUICK_MONTHS = [1, 3]
+# generate_transactions builds one dict per transaction, so without the cap
+# the size curve has to stop well below SIZES[-1]
+UNCAPPED_SIZES = [1000, 5000, 10000, 20000]
+MODEL_NAMES = ["RandomForest", "XGBoost", "DeepLearning - MLP", "DeepLearning - TabNet"]
+
+# Same segment mix and caps as main.py (650/220/130, max_sample=15000)
+SEGMENT_SHARES = (0.65, 0.22, 0.13)
+TX_MAX_SAMPLE = 15000
+TRAIN_MAX_SAMPLE = 8000
+
+BASELINE_FILE = "benchmark_baseline.json"
+
+STUB_PARSED = {
+    'segment': ['SME'],
+    'sector': ['Retail'],
+    'product_type': 'Loan',
+    'product_category': 'Consumer',
+    'promotion': ['Cashback', 'Digital Convenience'],
+    'channel': ['Digital'],
+    'term': 24,
+    'interest_type': 'Fixed',
+    'risk_level': 'Medium',
+    'innovation_level': 'High',
+    'launch_year': 2024,
+}
+
+def stub_parse_with_mistral(user_input):
+    return dict(STUB_PARSED)
+
+def split_population(n_customers):
+    n_individual = int(round(n_customers * SEGMENT_SHARES[0]))
+    n_sme = int(round(n_customers * SEGMENT_SHARES[1]))
+    n_corporate = n_customers - n_individual - n_sme
+    return n_individual, n_sme, n_corporate
+
+def balanced_interest_labels(df_main):
+    # Customers without transactions have no total_amount and land in class 0
+    total = df_main['total_amount']
+    return (total > total.median()).astype(int)
+
+def training_classes(df, max_sample):
+    # Same sample train_model draws before fitting
+    df_sample = df.sample(n=max_sample, random_state=42) if len(df) > max_sample else df
+    _, y, _ = get_features_targets(df_sample)
+    return np.unique(y)
+
+def current_rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        # ru_maxrss would only give the process lifetime peak, which is useless per stage
+        return None
+
+class RSSSampler:
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.start = None
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        rss = current_rss()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.start = current_rss()
+        self.peak = self.start
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return False
+
+def measure(fn, repeat):
+    result = None
+    best = None
+    peak = None
+    start = None
+    for _ in range(repeat):
+        gc.collect()
+        with RSSSampler() as sampler:
+            t0 = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - t0
+        if best is None or elapsed < best:
+            best = elapsed
+        if sampler.peak is not None and (peak is None or sampler.peak > peak):
+            peak, start = sampler.peak, sampler.start
+    return result, best, peak, start
+
+def record(results, curve, n_customers, months, tx_customers, train_rows, stage, n_items, seconds, peak, start):
+    mb = 1024 * 1024
+    row = {
+        'curve': curve,
+        'customers': n_customers,
+        'months': months,
+        'tx_customers': tx_customers,
+        'train_rows': train_rows,
+        'stage': stage,
+        'items': int(n_items),
+        'seconds': round(seconds, 6),
+        'throughput': round(n_items / seconds, 2) if seconds > 0 else None,
+        'peak_rss_mb': round(peak / mb, 2) if peak is not None else None,
+        'rss_delta_mb': round((peak - start) / mb, 2) if peak is not None and start is not None else None,
+    }
+    results.append(row)
+    print(
+        f"{curve:<7} customers={n_customers:<8} months={months:<3} tx_customers={tx_customers:<8} "
+        f"train_rows={train_rows:<8} {stage:<36} {row['seconds']:>10.3f}s {row['throughput'] or 0:>14.1f}/s "
+        f"{row['rss_delta_mb'] if row['rss_delta_mb'] is not None else float('nan'):>+10.1f} MB"
+    )
+
+def run_point(curve, n_customers, months, models, repeat, seed, tx_max_sample, train_max_sample):
+    # A cap of None means no sampling: the stage sees the whole population
+    tx_max_sample = tx_max_sample or n_customers
+    train_max_sample = train_max_sample or n_customers
+    tx_customers = min(n_customers, tx_max_sample)
+    train_rows = min(n_customers, train_max_sample)
+    results = []
+    filters = stub_parse_with_mistral("")
+
+    def add(stage, n_items, t, peak, start):
+        record(results, curve, n_customers, months, tx_customers, train_rows, stage, n_items, t, peak, start)
+
+    df_customers, t, peak, start = measure(lambda: generate_customers(*split_population(n_customers), seed=seed), repeat)
+    add("generate_customers", len(df_customers), t, peak, start)
+
+    def gen_transactions():
+        np.random.seed(seed)
+        return generate_transactions(df_customers, months=months, max_sample=tx_max_sample)
+    df_transactions, t, peak, start = measure(gen_transactions, repeat)
+    add("generate_transactions", len(df_transactions), t, peak, start)
+
+    df_main, t, peak, start = measure(lambda: aggregate_transactions(df_customers, df_transactions), repeat)
+    add("aggregate_transactions", len(df_transactions), t, peak, start)
+
+    scores, t, peak, start = measure(lambda: df_main.apply(lambda row: product_effect_score(row, filters), axis=1), repeat)
+    add("product_effect_score", len(df_main), t, peak, start)
+    df_main['product_score'] = scores
+
+    df_main['past_product_interest'] = balanced_interest_labels(df_main)
+    if models and len(training_classes(df_main, train_max_sample)) < 2:
+        raise RuntimeError(
+            f"Training sample for customers={n_customers} months={months} has a single class, "
+            "train_model would skip fitting"
+        )
+
+    proba = None
+    for model_name in models:
+        # train_model fits on train_rows but builds features for and scores every customer
+        model_proba, t, peak, start = measure(lambda: train_model(df_main, model_name, max_sample=train_max_sample), repeat)
+        add(f"train_model[{model_name}]", len(df_main), t, peak, start)
+        if proba is None or model_name == "RandomForest":
+            proba = model_proba
+
+    if proba is not None:
+        df_main['product_interest_probability'] = proba * df_main['product_score']
+        _, t, peak, start = measure(lambda: df_main['product_interest_probability'].apply(twin_response_label), repeat)
+        add("twin_response_label", len(df_main), t, peak, start)
+    return results
+
+def run_suite(sizes, months_list, base_size, base_months, models, repeat, seed, tx_max_sample, train_max_sample):
+    results = []
+    shared = None
+    for n_customers in sizes:
+        point = run_point("size", n_customers, base_months, models, repeat, seed, tx_max_sample, train_max_sample)
+        if n_customers == base_size:
+            shared = point
+        results += point
+    for months in months_list:
+        if months == base_months and shared is not None:
+            # Same population and months as a size point, reuse it instead of running the pipeline twice
+            results += [dict(row, curve="months") for row in shared]
+            continue
+        results += run_point("months", base_size, months, models, repeat, seed, tx_max_sample, train_max_sample)
+    return results
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+def result_key(row):
+    # Effective sizes are part of the key so capped and uncapped runs never compare
+    return (
+        row['curve'], row['customers'], row['months'],
+        row.get('tx_customers'), row.get('train_rows'), row['stage']
+    )
+
+def compare(results, baseline, threshold, min_seconds, min_rss_mb):
+    base = {result_key(row): row for row in baseline.get('results', [])}
+    regressions = []
+    n_compared = 0
+    for row in results:
+        old = base.get(result_key(row))
+        if old is None:
+            continue
+        n_compared += 1
+        if row['seconds'] > old['seconds'] * (1 + threshold) and row['seconds'] - old['seconds'] > min_seconds:
+            regressions.append((row, 'seconds', old['seconds'], row['seconds']))
+        # Gate on the stage's own growth, not the process RSS that includes the imported libraries
+        new_rss, old_rss = row['rss_delta_mb'], old.get('rss_delta_mb')
+        if new_rss is not None and old_rss is not None:
+            if new_rss > max(old_rss, 0) * (1 + threshold) and new_rss - old_rss > min_rss_mb:
+                regressions.append((row, 'rss_delta_mb', old_rss, new_rss))
+    return regressions, n_compared
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the digital twin simulation pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="*", default=None, help="Customer populations for the size curve; no values skips it.")
+    parser.add_argument("--months", type=int, nargs="*", default=None, help="Months for the months curve; no values skips it.")
+    parser.add_argument("--base-size", type=int, default=1000, help="Population used for the months curve.")
+    parser.add_argument("--base-months", type=int, default=6, help="Months used for the size curve.")
+    parser.add_argument("--models", nargs="+", default=MODEL_NAMES, choices=MODEL_NAMES, help="train_model backends to benchmark.")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage; the fastest one is reported.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tx-max-sample", type=int, default=TX_MAX_SAMPLE, help="max_sample passed to generate_transactions.")
+    parser.add_argument("--train-max-sample", type=int, default=TRAIN_MAX_SAMPLE, help="max_sample passed to train_model.")
+    parser.add_argument("--uncapped", action="store_true", help=f"Disable both sample caps; the size curve defaults to {UNCAPPED_SIZES}.")
+    parser.add_argument("--quick", action="store_true", help=f"Use sizes {QUICK_SIZES} and months {QUICK_MONTHS}.")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline JSON file.")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results to the baseline file instead of comparing.")
+    parser.add_argument("--allow-missing-baseline", action="store_true", help="Exit 0 instead of failing when the baseline file does not exist.")
+    parser.add_argument("--output", default=None, help="Also write the results to this JSON file.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown / memory growth (0.25 = 25%%).")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="Ignore slowdowns smaller than this many seconds.")
+    parser.add_argument("--min-rss-mb", type=float, default=10.0, help="Ignore memory growth smaller than this many MB.")
+    args = parser.parse_args(argv)
+
+    if not args.save_baseline and not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --save-baseline to create one.")
+        if not args.allow_missing_baseline:
+            return 2
+
+    if args.sizes is not None:
+        sizes = args.sizes
+    else:
+        sizes = UNCAPPED_SIZES if args.uncapped else QUICK_SIZES if args.quick else SIZES
+    months_list = args.months if args.months is not None else QUICK_MONTHS if args.quick else MONTHS
+    tx_max_sample = None if args.uncapped else args.tx_max_sample
+    train_max_sample = None if args.uncapped else args.train_max_sample
+    if current_rss() is None:
+        print("WARNING: RSS cannot be read on this platform, memory is not measured or compared.")
+
+    results = run_suite(
+        sizes, months_list, args.base_size, args.base_months, args.models,
+        args.repeat, args.seed, tx_max_sample, train_max_sample
+    )
+    report = {
+        'environment': environment(),
+        'settings': {
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'tx_max_sample': tx_max_sample,
+            'train_max_sample': train_max_sample,
+            'train_label': 'total_amount > median',
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('settings') != report['settings']:
+        print(f"WARNING: baseline settings differ: {baseline.get('settings')}")
+    if baseline.get('environment') != report['environment']:
+        print("WARNING: baseline was recorded on a different environment, timings may not be comparable.")
+
+    regressions, n_compared = compare(results, baseline, args.threshold, args.min_seconds, args.min_rss_mb)
+    print(f"Compared {n_compared} of {len(results)} results against the baseline")
+    if n_compared == 0:
+        print("WARNING: no result matches a baseline entry, nothing was checked.")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+        return 0
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+    for row, metric, old, new in regressions:
+        print(
+            f"  {row['curve']} customers={row['customers']} months={row['months']} "
+            f"tx_customers={row['tx_customers']} train_rows={row['train_rows']} {row['stage']}: {metric} {old} -> {new}"
+        )
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -55,3 +55,12 @@ def product_effect_score(row, filters):
     if row.get('tx_category_count', 0) > 8:
         score *= 1.04
     return score
+
+def twin_response_label(x):
+    return (
+        'apply/purchase' if x > 0.78 else
+        'high interest' if x > 0.55 else
+        'medium interest' if x > 0.35 else
+        'neutral' if x > 0.18 else
+        'negative response'
+    )
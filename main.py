@@ -4,7 +4,7 @@ import numpy as np
 
 from config import SECTOR_LIST, INDIVIDUAL_CATEGORIES, PRODUCT_TYPES, PRODUCT_CATEGORIES, PROMOTIONS
 from data_generator import generate_customers, generate_transactions
-from features import aggregate_transactions, product_effect_score
+from features import aggregate_transactions, product_effect_score, twin_response_label
 from model_train import train_model
 from viz import (
     plot_pie_twin_response, plot_twin_distribution, plot_segment_heatmap,
@@ -161,13 +161,7 @@ if test_mode == "A/B Test":
             df_main_a['product_score'] = df_main_a.apply(lambda row: product_effect_score(row, filters_a), axis=1)
             proba_a = train_model(df_main_a, "RandomForest")
             df_main_a['product_interest_probability'] = proba_a * df_main_a['product_score']
-            df_main_a['twin_response'] = df_main_a['product_interest_probability'].apply(lambda x:
-                'apply/purchase' if x > 0.78 else
-                'high interest' if x > 0.55 else
-                'medium interest' if x > 0.35 else
-                'neutral' if x > 0.18 else
-                'negative response'
-            )
+            df_main_a['twin_response'] = df_main_a['product_interest_probability'].apply(twin_response_label)
 
             # B
             filters_b = st.session_state['filters_b']
@@ -175,13 +169,7 @@ if test_mode == "A/B Test":
             df_main_b['product_score'] = df_main_b.apply(lambda row: product_effect_score(row, filters_b), axis=1)
             proba_b = train_model(df_main_b, "RandomForest")
             df_main_b['product_interest_probability'] = proba_b * df_main_b['product_score']
-            df_main_b['twin_response'] = df_main_b['product_interest_probability'].apply(lambda x:
-                'apply/purchase' if x > 0.78 else
-                'high interest' if x > 0.55 else
-                'medium interest' if x > 0.35 else
-                'neutral' if x > 0.18 else
-                'negative response'
-            )
+            df_main_b['twin_response'] = df_main_b['product_interest_probability'].apply(twin_response_label)
 
             st.markdown("### A/B Results Visualization")
             col1, col2 = st.columns(2)
@@ -264,13 +252,7 @@ if test_mode == "Single Scenario":
         df_main['product_score'] = df_main.apply(lambda row: product_effect_score(row, filters), axis=1)
         proba = train_model(df_main, "RandomForest")
         df_main['product_interest_probability'] = proba * df_main['product_score']
-        df_main['twin_response'] = df_main['product_interest_probability'].apply(lambda x:
-            'apply/purchase' if x > 0.78 else
-            'high interest' if x > 0.55 else
-            'medium interest' if x > 0.35 else
-            'neutral' if x > 0.18 else
-            'negative response'
-        )
+        df_main['twin_response'] = df_main['product_interest_probability'].apply(twin_response_label)
         st.subheader("Results")
         plot_pie_twin_response(df_main, variant_label="A")
         plot_twin_distribution(df_main, variant_label="A")
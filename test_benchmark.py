@@ -0,0 +1,84 @@
+#test_benchmark.py
+import json
+
+import benchmark
+
+def make_row(stage="generate_customers", seconds=1.0, rss_delta_mb=50.0, customers=1000, tx_customers=1000, train_rows=1000):
+    return {
+        'curve': 'size',
+        'customers': customers,
+        'months': 6,
+        'tx_customers': tx_customers,
+        'train_rows': train_rows,
+        'stage': stage,
+        'items': customers,
+        'seconds': seconds,
+        'throughput': customers / seconds,
+        'peak_rss_mb': 700.0,
+        'rss_delta_mb': rss_delta_mb,
+    }
+
+def run_compare(new_row, old_row, threshold=0.25, min_seconds=0.05, min_rss_mb=10.0):
+    return benchmark.compare([new_row], {'results': [old_row]}, threshold, min_seconds, min_rss_mb)
+
+def test_compare_within_threshold():
+    regressions, n_compared = run_compare(make_row(seconds=1.2, rss_delta_mb=60.0), make_row())
+    assert regressions == []
+    assert n_compared == 1
+
+def test_compare_flags_slowdown():
+    regressions, _ = run_compare(make_row(seconds=1.3), make_row())
+    assert [(metric, old, new) for _, metric, old, new in regressions] == [('seconds', 1.0, 1.3)]
+
+def test_compare_ignores_slowdown_below_min_seconds():
+    regressions, _ = run_compare(make_row(seconds=0.04), make_row(seconds=0.01))
+    assert regressions == []
+
+def test_compare_flags_memory_growth():
+    regressions, _ = run_compare(make_row(rss_delta_mb=80.0), make_row())
+    assert [(metric, old, new) for _, metric, old, new in regressions] == [('rss_delta_mb', 50.0, 80.0)]
+
+def test_compare_ignores_memory_growth_below_min_rss_mb():
+    regressions, _ = run_compare(make_row(rss_delta_mb=8.0), make_row(rss_delta_mb=1.0))
+    assert regressions == []
+
+def test_compare_skips_unmeasured_memory():
+    regressions, _ = run_compare(make_row(rss_delta_mb=None), make_row())
+    assert regressions == []
+
+def test_compare_does_not_match_capped_and_uncapped_rows():
+    capped = make_row(customers=20000, tx_customers=15000, train_rows=8000)
+    uncapped = make_row(customers=20000, tx_customers=20000, train_rows=20000, seconds=10.0)
+    regressions, n_compared = run_compare(uncapped, capped)
+    assert regressions == []
+    assert n_compared == 0
+
+def write_baseline(path, rows):
+    with open(path, "w") as f:
+        json.dump({'results': rows}, f)
+
+def test_main_missing_baseline_fails(tmp_path):
+    assert benchmark.main(["--baseline", str(tmp_path / "missing.json")]) == 2
+
+def test_main_missing_baseline_allowed(tmp_path, monkeypatch):
+    monkeypatch.setattr(benchmark, "run_suite", lambda *args: [make_row()])
+    assert benchmark.main(["--baseline", str(tmp_path / "missing.json"), "--allow-missing-baseline"]) == 0
+
+def test_main_passes_against_matching_baseline(tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    write_baseline(baseline, [make_row()])
+    monkeypatch.setattr(benchmark, "run_suite", lambda *args: [make_row(seconds=1.1)])
+    assert benchmark.main(["--baseline", str(baseline)]) == 0
+
+def test_main_fails_on_regression(tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    write_baseline(baseline, [make_row()])
+    monkeypatch.setattr(benchmark, "run_suite", lambda *args: [make_row(seconds=2.0)])
+    assert benchmark.main(["--baseline", str(baseline)]) == 1
+
+def test_main_save_baseline_writes_results(tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    monkeypatch.setattr(benchmark, "run_suite", lambda *args: [make_row()])
+    assert benchmark.main(["--baseline", str(baseline), "--save-baseline"]) == 0
+    with open(baseline) as f:
+        assert json.load(f)['results'] == [make_row()]